@@ -2,33 +2,30 @@
 # A setuptools-based setup module for the project.
 #
 
-import ast
 import re
 from setuptools import setup
 
 
-# Utility function to read the contents of the given file.
-def read_file(file_path):
-    with open(file_path) as f:
-        return f.read()
+# Regular expression matching the assignment of the project version in the
+# git-edit-index file.
+VERSION_RE = re.compile(r'__version__\s*=\s*[\'"]([^\'"]+)[\'"]')
 
 
 # Utility function to return the project version from the git-edit-index file.
 def get_project_version():
-    return ast.literal_eval(
-        re.search(
-            r'__version__\s+=\s+(.*)',
-            read_file('git-edit-index')
-        ).group(1)
-    )
+    # The version is defined near the beginning of the file, so there is no
+    # need to read the whole file.
+    with open('git-edit-index') as f:
+        for line in f:
+            m = VERSION_RE.match(line)
+            if m is not None:
+                return m.group(1)
+    raise RuntimeError('cannot find __version__ in git-edit-index')
 
 
+# The rest of the metadata is in setup.cfg.
 setup(
-    name='git-edit-index',
     version=get_project_version(),
-    description=(
-        'A git command that opens an editor to stage or unstage files.'
-    ),
     long_description="""
 This command represents a faster alternative to ``git add -i`` or ``git gui``.
 It allows you to stage or unstage files from the index in an editor, just like
@@ -59,29 +56,5 @@ to them since the last commit.
 See the `project's homepage <https://github.com/s3rvac/git-edit-index>`_ for
 more information.
     """.strip(),
-    author='Petr Zemek',
-    author_email='s3rvac@petrzemek.net',
-    url='https://github.com/s3rvac/git-edit-index',
-    license=read_file('LICENSE'),
-    classifiers=[
-        'Development Status :: 4 - Beta',
-        'Intended Audience :: Developers',
-        'License :: OSI Approved :: MIT License',
-        'Operating System :: OS Independent',
-        'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.7',
-        'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.7',
-        'Programming Language :: Python :: 3.8',
-        'Programming Language :: Python :: 3.9',
-        'Programming Language :: Python :: 3.10',
-        'Programming Language :: Python :: Implementation :: CPython',
-        'Programming Language :: Python :: Implementation :: PyPy',
-        'Topic :: Software Development :: Version Control',
-    ],
-    keywords='git editor index staging unstaging',
-    py_modules=[],
-    scripts=[
-        'git-edit-index'
-    ]
+    py_modules=[]
 )
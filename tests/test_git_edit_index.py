@@ -30,36 +30,43 @@
 #    DEALINGS IN THE SOFTWARE.
 #
 
+import importlib
 import os
+import sys
 import unittest
-
-try:
-    from cStringIO import StringIO  # Python 2
-except ImportError:
-    from io import StringIO  # Python 3
-
-try:
-    from unittest import mock  # Python 3
-except ImportError:
-    import mock  # Python 2
-
-from git_edit_index import Index
-from git_edit_index import IndexEntry
-from git_edit_index import NoIndexEntry
-from git_edit_index import __version__
-from git_edit_index import ask_user_whether_reflect_changes_on_empty_buffer
-from git_edit_index import current_index
-from git_edit_index import edit_index
-from git_edit_index import editor_cmd
-from git_edit_index import git_status
-from git_edit_index import main
-from git_edit_index import perform_git_action
-from git_edit_index import reflect_index_change
-from git_edit_index import reflect_index_changes
-from git_edit_index import remove
-from git_edit_index import repository_path
-from git_edit_index import should_reflect_changes_on_empty_buffer
-from git_edit_index import value_for_config_option
+from unittest import mock
+
+from git_edit_index import (
+    Index,
+    IndexEntry,
+    NoIndexEntry,
+    __version__,
+    args_parser,
+    ask_user_whether_reflect_changes_on_empty_buffer,
+    current_index,
+    edit_index,
+    editor_cmd,
+    git_status,
+    main,
+    parse_args,
+    perform_git_action,
+    reflect_index_change,
+    reflect_index_changes,
+    remove,
+    repository_path,
+    should_reflect_changes_on_empty_buffer,
+    value_for_config_option,
+)
+
+
+def resolve(name):
+    """Returns the object with the given dotted name (e.g. 'git_edit_index.os').
+    """
+    module_name, *attr_names = name.split('.')
+    obj = importlib.import_module(module_name)
+    for attr_name in attr_names:
+        obj = getattr(obj, attr_name)
+    return obj
 
 
 # Do not inherit from unittest.TestCase because WithPatching is a mixin, not a
@@ -67,11 +74,166 @@ from git_edit_index import value_for_config_option
 class WithPatching:
     """Mixin for tests that perform patching during their setup."""
 
-    def patch(self, what, with_what, create=False):
-        """Patches what with with_what."""
-        patcher = mock.patch(what, with_what, create=create)
-        patcher.start()
-        self.addCleanup(patcher.stop)
+    def patch(self, obj, attr_name, with_what):
+        """Patches the given attribute of obj with with_what."""
+        # Substitute the attribute directly instead of using mock.patch(),
+        # which is considerably slower as it has to resolve the target from
+        # a string.
+        self.addCleanup(setattr, obj, attr_name, getattr(obj, attr_name))
+        setattr(obj, attr_name, with_what)
+
+
+# Do not inherit from unittest.TestCase because ClassPatching is a mixin, not a
+# base class for tests. However, it has to precede unittest.TestCase in the
+# list of base classes. Otherwise, its setUpClass() would be hidden by the one
+# from unittest.TestCase.
+class ClassPatching:
+    """Mixin for tests that patch the same targets in all their tests.
+
+    The targets are given in PATCH_TARGETS as pairs (target, factory), where
+    factory creates the replacement of the target (usually, it is a mock class
+    or a function creating an autospecced function). The targets are patched
+    only once per class, which also takes care of restoring the originals.
+    Before each test, fresh replacements are created by the factories and
+    assigned to the targets, so no state is carried over between tests. The
+    replacement of a target is accessible via an attribute whose name is the
+    target without the 'git_edit_index.' prefix and with dots replaced by
+    underscores (e.g. 'git_edit_index.os.remove' -> self.os_remove).
+    """
+
+    PATCH_TARGETS = ()
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        # Tuples (parent object, attribute, attribute on self, factory) used in
+        # setUp().
+        cls._targets = []
+        # Attributes of the same object (e.g. of the git_edit_index module) are
+        # patched together by a single patcher.
+        attrs_by_parent = {}
+        for target, factory in cls.PATCH_TARGETS:
+            parent, attr = target.rsplit('.', 1)
+            attrs_by_parent.setdefault(parent, []).append(attr)
+            self_attr = target.replace('git_edit_index.', '', 1).replace('.', '_')
+            cls._targets.append((resolve(parent), attr, self_attr, factory))
+
+        for parent, attrs in attrs_by_parent.items():
+            # The patched attributes are set to None here because setUp()
+            # assigns a fresh replacement to them before each test anyway.
+            patcher = mock.patch.multiple(parent, **dict.fromkeys(attrs))
+            patcher.start()
+            # Class cleanups are run even when setUpClass() fails, so the
+            # patchers that have already been started are always stopped.
+            cls.addClassCleanup(patcher.stop)
+
+    def setUp(self):
+        super().setUp()
+
+        for parent, attr, self_attr, factory in self._targets:
+            replacement = factory()
+            setattr(parent, attr, replacement)
+            # Store the replacement on the instance (not the class) so that
+            # replacements that are plain functions do not become methods.
+            setattr(self, self_attr, replacement)
+
+    def assert_called_once_as(self, m, *args, **kwargs):
+        """Asserts that the given mock was called exactly once and with the
+        given arguments.
+
+        It compares the call directly instead of going through
+        assert_called_once_with(), which is slower.
+        """
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(m.call_args, mock.call(*args, **kwargs))
+
+
+def root_repository_path_replacement():
+    """Creates a replacement of repository_path() for tests that only need some
+    path to the repository.
+    """
+    return lambda: '/'
+
+
+class OutputSink:
+    """A minimal writable stream that stores everything that is written to it.
+
+    It is used instead of io.StringIO to capture stdout and stderr.
+    """
+
+    __slots__ = ('parts',)
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, s):
+        self.parts.append(s)
+
+    def flush(self):
+        pass
+
+    def getvalue(self):
+        """Returns everything that has been written so far."""
+        return ''.join(self.parts)
+
+
+# Entries for 'file.txt' with all possible statuses. Tested code never modifies
+# entries, so they are created only once and shared by all tests.
+ADDED_FILE = IndexEntry('A', 'file.txt')
+MODIFIED_FILE = IndexEntry('M', 'file.txt')
+DELETED_FILE = IndexEntry('D', 'file.txt')
+PATCHED_FILE = IndexEntry('P', 'file.txt')
+UNTRACKED_FILE = IndexEntry('?', 'file.txt')
+IGNORED_FILE = IndexEntry('!', 'file.txt')
+MISSING_FILE = NoIndexEntry('file.txt')
+
+# An index with a single entry. Like the entries above, tests must not modify
+# it.
+MODIFIED_FILE_INDEX = Index([MODIFIED_FILE])
+
+# Text of an index with three entries (in our format).
+THREE_ENTRIES_TEXT = (
+    'M file1.txt\n'
+    '? file2.txt\n'
+    '! file3.txt\n'
+)
+
+# Full paths to 'file.txt' and 'dir' in a repository located in '/' (see
+# root_repository_path_replacement()).
+ROOT_FILE_PATH = os.path.join('/', 'file.txt')
+ROOT_DIR_PATH = os.path.join('/', 'dir')
+
+
+class ClassPatchingTests(unittest.TestCase):
+    """Tests for the ClassPatching mixin."""
+
+    def test_no_state_is_carried_over_between_tests(self):
+        class Tests(ClassPatching, unittest.TestCase):
+            PATCH_TARGETS = (
+                ('git_edit_index.subprocess', mock.Mock),
+            )
+
+            def test_1_modify_replacement(self):
+                self.subprocess.check_output.side_effect = RuntimeError
+                self.subprocess.CalledProcessError = RuntimeError
+
+            def test_2_check_replacement(self):
+                self.assertIs(resolve('git_edit_index.subprocess'), self.subprocess)
+                self.assertIsNone(self.subprocess.check_output.side_effect)
+                self.assertIsNot(self.subprocess.CalledProcessError, RuntimeError)
+
+        orig_subprocess = resolve('git_edit_index.subprocess')
+        suite = unittest.TestSuite([
+            Tests('test_1_modify_replacement'),
+            Tests('test_2_check_replacement'),
+        ])
+        result = unittest.TestResult()
+
+        suite.run(result)
+
+        self.assertTrue(result.wasSuccessful(), result.failures + result.errors)
+        self.assertIs(resolve('git_edit_index.subprocess'), orig_subprocess)
 
 
 class IndexTests(unittest.TestCase):
@@ -94,11 +256,7 @@ class IndexTests(unittest.TestCase):
         self.assertEqual(len(index), 0)
 
     def test_from_text_returns_correct_index_when_there_are_lines(self):
-        index = Index.from_text(
-            'M file1.txt\n'
-            '? file2.txt\n'
-            '! file3.txt\n'
-        )
+        index = Index.from_text(THREE_ENTRIES_TEXT)
 
         self.assertEqual(len(index), 3)
         self.assertEqual(index.entry_for('file1.txt').status, 'M')
@@ -124,7 +282,7 @@ class IndexTests(unittest.TestCase):
 
         # The last entry has to end with a newline. Otherwise, some editors may
         # have problems displaying it.
-        self.assertEqual(str(index), 'M file1.txt\n? file2.txt\n! file3.txt\n')
+        self.assertEqual(str(index), THREE_ENTRIES_TEXT)
 
 
 class IndexEntryTests(unittest.TestCase):
@@ -136,127 +294,75 @@ class IndexEntryTests(unittest.TestCase):
         self.assertEqual(entry.status, 'M')
         self.assertEqual(entry.file, 'file.txt')
 
-    def test_from_line_returns_none_for_empty_line(self):
-        self.assertIsNone(IndexEntry.from_line(''))
-
-    def test_from_line_returns_none_for_unknown_status(self):
-        self.assertIsNone(IndexEntry.from_line('# file.txt'))
-
-    def test_from_line_returns_correct_entry_for_added_file_git_format(self):
-        entry = IndexEntry.from_line('M  file.txt')
-
-        self.assertEqual(entry.status, 'A')
-        self.assertEqual(entry.file, 'file.txt')
-
-    def test_from_line_returns_correct_entry_for_added_file_our_format(self):
-        entry = IndexEntry.from_line('M file.txt')
-
-        self.assertEqual(entry.status, 'M')
-        self.assertEqual(entry.file, 'file.txt')
-
-    def test_from_line_returns_correct_entry_for_modified_file_git_format(self):
-        entry = IndexEntry.from_line(' M file.txt')
-
-        self.assertEqual(entry.status, 'M')
-        self.assertEqual(entry.file, 'file.txt')
-
-    def test_from_line_returns_correct_entry_for_modified_file_our_format(self):
-        entry = IndexEntry.from_line('M file.txt')
-
-        self.assertEqual(entry.status, 'M')
-        self.assertEqual(entry.file, 'file.txt')
-
-    def test_from_line_returns_correct_entry_for_deleted_file_git_format(self):
-        entry = IndexEntry.from_line(' D file.txt')
-
-        self.assertEqual(entry.status, 'D')
-        self.assertEqual(entry.file, 'file.txt')
-
-    def test_from_line_returns_correct_entry_for_deleted_file_our_format(self):
-        entry = IndexEntry.from_line('D file.txt')
-
-        self.assertEqual(entry.status, 'D')
-        self.assertEqual(entry.file, 'file.txt')
-
-    def test_from_line_returns_correct_entry_for_untracked_file_git_format(self):
-        entry = IndexEntry.from_line('?? file.txt')
-
-        self.assertEqual(entry.status, '?')
-        self.assertEqual(entry.file, 'file.txt')
-
-    def test_from_line_returns_correct_entry_for_untracked_file_our_format(self):
-        entry = IndexEntry.from_line('? file.txt')
-
-        self.assertEqual(entry.status, '?')
-        self.assertEqual(entry.file, 'file.txt')
-
-    def test_from_line_returns_correct_entry_for_ignored_file_git_format(self):
-        entry = IndexEntry.from_line('!! file.txt')
-
-        self.assertEqual(entry.status, '!')
-        self.assertEqual(entry.file, 'file.txt')
-
-    def test_from_line_returns_correct_entry_for_ignored_file_our_format(self):
-        entry = IndexEntry.from_line('! file.txt')
-
-        self.assertEqual(entry.status, '!')
-        self.assertEqual(entry.file, 'file.txt')
-
-    def test_from_line_returns_correct_entry_for_custom_patch_status(self):
-        entry = IndexEntry.from_line('P file.txt')
-
-        self.assertEqual(entry.status, 'P')
-        self.assertEqual(entry.file, 'file.txt')
-
-    def test_from_line_ignores_case_of_status(self):
-        entry = IndexEntry.from_line('a file.txt')
-
-        self.assertEqual(entry.status, 'A')
-        self.assertEqual(entry.file, 'file.txt')
+    # Pairs (line, expected status). The status of the created entry is always
+    # in our format and the file is always 'file.txt'. None means that no
+    # entry is created from the line.
+    FROM_LINE_CASES = [
+        # Added file.
+        ('M  file.txt', 'A'),  # git format
+        ('A file.txt', 'A'),  # our format
+        # Modified file.
+        (' M file.txt', 'M'),  # git format
+        ('M file.txt', 'M'),  # our format
+        # Deleted file.
+        (' D file.txt', 'D'),  # git format
+        ('D file.txt', 'D'),  # our format
+        # Untracked file.
+        ('?? file.txt', '?'),  # git format
+        ('? file.txt', '?'),  # our format
+        # Ignored file.
+        ('!! file.txt', '!'),  # git format
+        ('! file.txt', '!'),  # our format
+        # Custom status.
+        ('P file.txt', 'P'),
+        # The status is case-insensitive.
+        ('a file.txt', 'A'),
+        # Empty line.
+        ('', None),
+        # Unknown status.
+        ('# file.txt', None),
+    ]
+
+    def test_from_line_returns_correct_entry_for_all_supported_formats(self):
+        for line, status in self.FROM_LINE_CASES:
+            with self.subTest(line=line):
+                entry = IndexEntry.from_line(line)
+
+                if status is None:
+                    self.assertIsNone(entry)
+                else:
+                    self.assertEqual(entry.status, status)
+                    self.assertEqual(entry.file, 'file.txt')
 
     def test_repr_returns_correct_representation(self):
-        entry = IndexEntry('M', 'file.txt')
-
-        self.assertEqual(repr(entry), "IndexEntry('M', 'file.txt')")
+        self.assertEqual(repr(MODIFIED_FILE), "IndexEntry('M', 'file.txt')")
 
     def test_str_returns_correct_representation(self):
-        entry = IndexEntry('M', 'file.txt')
-
-        self.assertEqual(str(entry), 'M file.txt')
+        self.assertEqual(str(MODIFIED_FILE), 'M file.txt')
 
 
 class NoIndexEntryTests(unittest.TestCase):
     """Tests for NoIndexEntry."""
 
     def test_status_is_always_none(self):
-        entry = NoIndexEntry('file.txt')
-
-        self.assertIsNone(entry.status)
+        self.assertIsNone(MISSING_FILE.status)
 
     def test_file_returns_correct_value(self):
-        entry = NoIndexEntry('file.txt')
-
-        self.assertEqual(entry.file, 'file.txt')
+        self.assertEqual(MISSING_FILE.file, 'file.txt')
 
     def test_repr_returns_correct_representation(self):
-        entry = NoIndexEntry('file.txt')
-
-        self.assertEqual(repr(entry), "NoIndexEntry('file.txt')")
+        self.assertEqual(repr(MISSING_FILE), "NoIndexEntry('file.txt')")
 
     def test_str_returns_correct_representation(self):
-        entry = NoIndexEntry('file.txt')
+        self.assertEqual(str(MISSING_FILE), '- file.txt')
 
-        self.assertEqual(str(entry), '- file.txt')
 
-
-class CurrentIndexTests(unittest.TestCase, WithPatching):
+class CurrentIndexTests(ClassPatching, unittest.TestCase):
     """Tests for current_index()."""
 
-    def setUp(self):
-        super(CurrentIndexTests, self).setUp()
-
-        self.git_status = mock.Mock()
-        self.patch('git_edit_index.git_status', self.git_status)
+    PATCH_TARGETS = (
+        ('git_edit_index.git_status', mock.Mock),
+    )
 
     def test_creates_index_from_git_status(self):
         self.git_status.return_value = 'M file1\0M file2\0'
@@ -268,14 +374,12 @@ class CurrentIndexTests(unittest.TestCase, WithPatching):
         self.assertEqual(index[1].file, 'file2')
 
 
-class GitStatusTests(unittest.TestCase, WithPatching):
+class GitStatusTests(ClassPatching, unittest.TestCase):
     """Tests for git_status()."""
 
-    def setUp(self):
-        super(GitStatusTests, self).setUp()
-
-        self.subprocess = mock.Mock()
-        self.patch('git_edit_index.subprocess', self.subprocess)
+    PATCH_TARGETS = (
+        ('git_edit_index.subprocess', mock.Mock),
+    )
 
     def test_calls_correct_git_command_and_returns_correct_status(self):
         STATUS = 'status'
@@ -284,7 +388,8 @@ class GitStatusTests(unittest.TestCase, WithPatching):
         status = git_status()
 
         self.assertEqual(status, STATUS)
-        self.subprocess.check_output.assert_called_once_with(
+        self.assert_called_once_as(
+            self.subprocess.check_output,
             ['git', 'status', '--porcelain', '-z'],
             universal_newlines=True
         )
@@ -296,35 +401,25 @@ class GitStatusTests(unittest.TestCase, WithPatching):
         status = git_status(show_ignored='traditional')
 
         self.assertEqual(status, STATUS)
-        self.subprocess.check_output.assert_called_once_with(
+        self.assert_called_once_as(
+            self.subprocess.check_output,
             ['git', 'status', '--porcelain', '-z', '--ignored=traditional'],
             universal_newlines=True
         )
 
 
-class EditIndexTests(unittest.TestCase, WithPatching):
+class EditIndexTests(ClassPatching, unittest.TestCase):
     """Tests for edit_index()."""
 
-    def setUp(self):
-        super(EditIndexTests, self).setUp()
-
-        self.os = mock.MagicMock()
-        self.patch('git_edit_index.os', self.os)
-
-        self.subprocess = mock.Mock()
-        self.patch('git_edit_index.subprocess', self.subprocess)
-
-        self.tempfile = mock.MagicMock()
-        self.patch('git_edit_index.tempfile', self.tempfile)
-
-        self.open = mock.MagicMock()
-        self.patch('git_edit_index.open', self.open)
-
-        self.editor_cmd = mock.Mock()
-        self.patch('git_edit_index.editor_cmd', self.editor_cmd)
+    PATCH_TARGETS = (
+        ('git_edit_index.os', mock.MagicMock),
+        ('git_edit_index.subprocess', mock.Mock),
+        ('git_edit_index.tempfile', mock.Mock),
+        ('git_edit_index.open', mock.MagicMock),
+        ('git_edit_index.editor_cmd', mock.Mock),
+    )
 
     def test_stores_index_to_file_and_shows_it_to_user_and_returns_new_index(self):
-        index = Index([IndexEntry('M', 'file.txt')])
         self.editor_cmd.return_value = ['vim']
         tmp_fd = 123
         tmp_path = 'git-edit-index-temp'
@@ -333,51 +428,50 @@ class EditIndexTests(unittest.TestCase, WithPatching):
         tmp_f2 = self.open.return_value.__enter__.return_value
         tmp_f2.read.return_value = 'A file.txt\n'
 
-        new_index = edit_index(index)
+        new_index = edit_index(MODIFIED_FILE_INDEX)
 
         self.assertEqual(len(new_index), 1)
         self.assertEqual(new_index[0].status, 'A')
         self.assertEqual(new_index[0].file, 'file.txt')
-        tmp_f1.write.assert_called_once_with('M file.txt\n')
-        self.subprocess.call.assert_called_once_with(
+        self.assert_called_once_as(tmp_f1.write, 'M file.txt\n')
+        self.assert_called_once_as(
+            self.subprocess.call,
             self.editor_cmd() + [tmp_path]
         )
-        tmp_f2.read.assert_called_once_with()
-        self.os.remove.assert_called_once_with(tmp_path)
+        self.assert_called_once_as(tmp_f2.read)
+        self.assert_called_once_as(self.os.remove, tmp_path)
 
 
-class EditorCmdTests(unittest.TestCase, WithPatching):
+class EditorCmdTests(ClassPatching, unittest.TestCase):
     """Tests for editor_cmd()."""
 
-    def setUp(self):
-        super(EditorCmdTests, self).setUp()
+    PATCH_TARGETS = (
+        ('git_edit_index.subprocess', mock.Mock),
+    )
 
-        self.subprocess = mock.Mock()
-        self.patch('git_edit_index.subprocess', self.subprocess)
+    EDITOR_CMD = ('gvim', '-f')
 
     def test_calls_correct_git_command_and_returns_correct_cmd(self):
-        CMD = ['gvim', '-f']
         self.subprocess.check_output.return_value = '{}\n'.format(
-            ' '.join(CMD)
+            ' '.join(self.EDITOR_CMD)
         )
 
         cmd = editor_cmd()
 
-        self.subprocess.check_output.assert_called_once_with(
+        self.assert_called_once_as(
+            self.subprocess.check_output,
             ['git', 'var', 'GIT_EDITOR'],
             universal_newlines=True
         )
-        self.assertEqual(cmd, CMD)
+        self.assertEqual(cmd, list(self.EDITOR_CMD))
 
 
-class ReflectIndexChangesTests(unittest.TestCase, WithPatching):
+class ReflectIndexChangesTests(ClassPatching, unittest.TestCase):
     """Tests for reflect_index_changes()."""
 
-    def setUp(self):
-        super(ReflectIndexChangesTests, self).setUp()
-
-        self.reflect_index_change = mock.Mock()
-        self.patch('git_edit_index.reflect_index_change', self.reflect_index_change)
+    PATCH_TARGETS = (
+        ('git_edit_index.reflect_index_change', mock.Mock),
+    )
 
     def test_calls_reflect_index_change_for_correct_entries(self):
         entry1 = IndexEntry('M', 'file1.txt')
@@ -388,275 +482,170 @@ class ReflectIndexChangesTests(unittest.TestCase, WithPatching):
 
         reflect_index_changes(orig_index, new_index)
 
-        self.reflect_index_change.assert_called_once_with(entry1, entry3)
+        self.assert_called_once_as(self.reflect_index_change, entry1, entry3)
 
 
-class ReflectIndexChangeTests(unittest.TestCase, WithPatching):
+class ReflectIndexChangeTests(ClassPatching, unittest.TestCase):
     """Tests for reflect_index_change()."""
 
-    def setUp(self):
-        super(ReflectIndexChangeTests, self).setUp()
-
-        self.remove = mock.Mock()
-        self.patch('git_edit_index.remove', self.remove)
-
-        self.perform_git_action = mock.Mock()
-        self.patch('git_edit_index.perform_git_action', self.perform_git_action)
-
-    def test_performs_correct_action_when_untracked_file_is_to_be_added(self):
-        orig_entry = IndexEntry('?', 'file.txt')
-        new_entry = IndexEntry('A', 'file.txt')
-
-        reflect_index_change(orig_entry, new_entry)
-
-        self.perform_git_action.assert_called_once_with(['add', '-f'], 'file.txt')
+    PATCH_TARGETS = (
+        ('git_edit_index.remove', mock.Mock),
+        ('git_edit_index.perform_git_action', mock.Mock),
+    )
+
+    # Triples (original entry, new entry, expected call of perform_git_action())
+    # for changes that are reflected by a single git action.
+    SINGLE_ACTION_CASES = [
+        # Staging.
+        (UNTRACKED_FILE, ADDED_FILE, mock.call(['add', '-f'], 'file.txt')),
+        (IGNORED_FILE, ADDED_FILE, mock.call(['add', '-f'], 'file.txt')),
+        (MODIFIED_FILE, ADDED_FILE, mock.call(['add', '-f'], 'file.txt')),
+        (DELETED_FILE, ADDED_FILE, mock.call(['add', '-f'], 'file.txt')),
+        # Partial staging.
+        (MODIFIED_FILE, PATCHED_FILE,
+            mock.call(['add', '--patch'], 'file.txt', ignore_stdout=False)),
+        (DELETED_FILE, PATCHED_FILE,
+            mock.call(['add', '--patch'], 'file.txt', ignore_stdout=False)),
+        # Unstaging.
+        (ADDED_FILE, MODIFIED_FILE, mock.call('reset', 'file.txt')),
+        (ADDED_FILE, DELETED_FILE, mock.call('reset', 'file.txt')),
+        # Partial unstaging.
+        (ADDED_FILE, PATCHED_FILE,
+            mock.call(['reset', '--patch'], 'file.txt', ignore_stdout=False)),
+        # Reverting changes.
+        (MODIFIED_FILE, MISSING_FILE, mock.call('checkout', 'file.txt')),
+        (DELETED_FILE, MISSING_FILE, mock.call('checkout', 'file.txt')),
+        # Untracking.
+        (MODIFIED_FILE, UNTRACKED_FILE, mock.call(['rm', '--cached'], 'file.txt')),
+    ]
+
+    def test_performs_correct_action_for_changes_reflected_by_single_action(self):
+        for orig_entry, new_entry, expected_call in self.SINGLE_ACTION_CASES:
+            with self.subTest(orig_entry=orig_entry, new_entry=new_entry):
+                self.perform_git_action.reset_mock()
+
+                reflect_index_change(orig_entry, new_entry)
+
+                self.assertEqual(self.perform_git_action.mock_calls, [expected_call])
 
     def test_performs_correct_action_when_untracked_file_is_to_be_deleted(self):
-        orig_entry = IndexEntry('?', 'file.txt')
-        new_entry = NoIndexEntry('file.txt')
-
-        reflect_index_change(orig_entry, new_entry)
+        reflect_index_change(UNTRACKED_FILE, MISSING_FILE)
 
-        self.remove.assert_called_once_with('file.txt')
+        self.assert_called_once_as(self.remove, 'file.txt')
         self.assertFalse(self.perform_git_action.called)
 
-    def test_performs_correct_action_when_ignored_file_is_to_be_added(self):
-        orig_entry = IndexEntry('!', 'file.txt')
-        new_entry = IndexEntry('A', 'file.txt')
-
-        reflect_index_change(orig_entry, new_entry)
-
-        self.perform_git_action.assert_called_once_with(['add', '-f'], 'file.txt')
-
     def test_performs_correct_action_when_ignored_file_is_to_be_deleted(self):
-        orig_entry = IndexEntry('!', 'file.txt')
-        new_entry = NoIndexEntry('file.txt')
+        reflect_index_change(IGNORED_FILE, MISSING_FILE)
 
-        reflect_index_change(orig_entry, new_entry)
-
-        self.remove.assert_called_once_with('file.txt')
+        self.assert_called_once_as(self.remove, 'file.txt')
         self.assertFalse(self.perform_git_action.called)
 
-    def test_performs_correct_action_when_modified_file_is_to_be_added(self):
-        orig_entry = IndexEntry('M', 'file.txt')
-        new_entry = IndexEntry('A', 'file.txt')
-
-        reflect_index_change(orig_entry, new_entry)
-
-        self.perform_git_action.assert_called_once_with(['add', '-f'], 'file.txt')
-
-    def test_performs_correct_action_when_modified_file_is_to_be_partially_added(self):
-        orig_entry = IndexEntry('M', 'file.txt')
-        new_entry = IndexEntry('P', 'file.txt')
-
-        reflect_index_change(orig_entry, new_entry)
-
-        self.perform_git_action.assert_called_once_with(
-            ['add', '--patch'],
-            'file.txt',
-            ignore_stdout=False
-        )
-
-    def test_performs_correct_action_when_deleted_file_is_to_be_added(self):
-        orig_entry = IndexEntry('D', 'file.txt')
-        new_entry = IndexEntry('A', 'file.txt')
-
-        reflect_index_change(orig_entry, new_entry)
-
-        self.perform_git_action.assert_called_once_with(['add', '-f'], 'file.txt')
-
-    def test_performs_correct_action_when_deleted_file_is_to_be_partially_added(self):
-        orig_entry = IndexEntry('D', 'file.txt')
-        new_entry = IndexEntry('P', 'file.txt')
-
-        reflect_index_change(orig_entry, new_entry)
-
-        self.perform_git_action.assert_called_once_with(
-            ['add', '--patch'],
-            'file.txt',
-            ignore_stdout=False
-        )
-
-    def test_performs_correct_action_when_modified_staged_file_is_to_be_unstaged(self):
-        orig_entry = IndexEntry('A', 'file.txt')
-        new_entry = IndexEntry('M', 'file.txt')
-
-        reflect_index_change(orig_entry, new_entry)
-
-        self.perform_git_action.assert_called_once_with('reset', 'file.txt')
-
-    def test_performs_correct_action_when_deleted_staged_file_is_to_be_unstaged(self):
-        orig_entry = IndexEntry('A', 'file.txt')
-        new_entry = IndexEntry('D', 'file.txt')
-
-        reflect_index_change(orig_entry, new_entry)
-
-        self.perform_git_action.assert_called_once_with('reset', 'file.txt')
-
-    def test_performs_correct_action_when_modified_staged_file_is_to_be_partially_reset(self):
-        orig_entry = IndexEntry('A', 'file.txt')
-        new_entry = IndexEntry('P', 'file.txt')
-
-        reflect_index_change(orig_entry, new_entry)
-
-        self.perform_git_action.assert_called_once_with(
-            ['reset', '--patch'],
-            'file.txt',
-            ignore_stdout=False
-        )
-
-    def test_performs_correct_action_when_modified_file_is_to_be_reset(self):
-        orig_entry = IndexEntry('M', 'file.txt')
-        new_entry = NoIndexEntry('file.txt')
-
-        reflect_index_change(orig_entry, new_entry)
-
-        self.perform_git_action.assert_called_once_with('checkout', 'file.txt')
-
     def test_performs_correct_actions_when_staged_file_is_to_be_reset(self):
-        orig_entry = IndexEntry('A', 'file.txt')
-        new_entry = NoIndexEntry('file.txt')
-
-        reflect_index_change(orig_entry, new_entry)
+        reflect_index_change(ADDED_FILE, MISSING_FILE)
 
         self.perform_git_action.assert_has_calls([
             mock.call('reset', 'file.txt'),
             mock.call('checkout', 'file.txt', ignore_stderr=True)
         ])
 
-    def test_performs_correct_action_when_deleted_file_is_to_be_reset(self):
-        orig_entry = IndexEntry('D', 'file.txt')
-        new_entry = NoIndexEntry('file.txt')
-
-        reflect_index_change(orig_entry, new_entry)
-
-        self.perform_git_action.assert_called_once_with('checkout', 'file.txt')
-
-    def test_performs_correct_action_when_modified_file_is_to_be_untracked(self):
-        orig_entry = IndexEntry('M', 'file.txt')
-        new_entry = IndexEntry('?', 'file.txt')
 
-        reflect_index_change(orig_entry, new_entry)
-
-        self.perform_git_action.assert_called_once_with(
-            ['rm', '--cached'], 'file.txt'
-        )
-
-
-class RemoveTests(unittest.TestCase, WithPatching):
+class RemoveTests(ClassPatching, unittest.TestCase):
     """Tests for remove()."""
 
-    def setUp(self):
-        super(RemoveTests, self).setUp()
-
-        self.repository_path = mock.Mock()
-        self.patch('git_edit_index.repository_path', self.repository_path)
-
-        self.os_path_isfile = mock.Mock()
-        self.patch('git_edit_index.os.path.isfile', self.os_path_isfile)
-
-        self.os_path_islink = mock.Mock()
-        self.patch('git_edit_index.os.path.islink', self.os_path_islink)
-
-        self.os_remove = mock.Mock()
-        self.patch('git_edit_index.os.remove', self.os_remove)
-
-        self.shutil_rmtree = mock.Mock()
-        self.patch('git_edit_index.shutil.rmtree', self.shutil_rmtree)
+    PATCH_TARGETS = (
+        ('git_edit_index.repository_path', root_repository_path_replacement),
+        ('git_edit_index.os.path.isfile', mock.Mock),
+        ('git_edit_index.os.path.islink', mock.Mock),
+        ('git_edit_index.os.remove', mock.Mock),
+        ('git_edit_index.shutil.rmtree', mock.Mock),
+    )
 
     def test_correct_command_is_called_to_remove_file(self):
-        self.repository_path.return_value = '/'
         self.os_path_isfile.return_value = True
         self.os_path_islink.return_value = False
 
         remove('file.txt')
 
-        self.os_remove.assert_called_once_with(os.path.join('/', 'file.txt'))
+        self.assert_called_once_as(self.os_remove, ROOT_FILE_PATH)
 
     def test_correct_command_is_called_to_remove_symlink(self):
-        self.repository_path.return_value = '/'
         self.os_path_isfile.return_value = False
         self.os_path_islink.return_value = True
 
         remove('file.txt')
 
-        self.os_remove.assert_called_once_with(os.path.join('/', 'file.txt'))
+        self.assert_called_once_as(self.os_remove, ROOT_FILE_PATH)
 
     def test_correct_command_is_called_to_remove_directory(self):
-        self.repository_path.return_value = '/'
         self.os_path_isfile.return_value = False
         self.os_path_islink.return_value = False
 
         remove('dir')
 
-        self.shutil_rmtree.assert_called_once_with(os.path.join('/', 'dir'))
+        self.assert_called_once_as(self.shutil_rmtree, ROOT_DIR_PATH)
 
 
-class PerformGitActionTests(unittest.TestCase, WithPatching):
+class PerformGitActionTests(ClassPatching, unittest.TestCase):
     """Tests for perform_git_action()."""
 
-    def setUp(self):
-        super(PerformGitActionTests, self).setUp()
-
-        self.subprocess = mock.Mock()
-        self.patch('git_edit_index.subprocess', self.subprocess)
-
-        self.repository_path = mock.Mock()
-        self.patch('git_edit_index.repository_path', self.repository_path)
+    PATCH_TARGETS = (
+        ('git_edit_index.subprocess', mock.Mock),
+        ('git_edit_index.repository_path', root_repository_path_replacement),
+    )
 
     def test_calls_git_with_proper_arguments_when_action_is_single_command(self):
-        self.repository_path.return_value = '/'
-
         perform_git_action('add', 'file.txt')
 
-        self.subprocess.call.assert_called_once_with(
-            ['git', 'add', '--', os.path.join('/', 'file.txt')],
+        self.assert_called_once_as(
+            self.subprocess.call,
+            ['git', 'add', '--', ROOT_FILE_PATH],
             stdout=self.subprocess.PIPE,
             stderr=None
         )
 
     def test_calls_git_with_proper_arguments_when_action_is_compound_command(self):
-        self.repository_path.return_value = '/'
-
         perform_git_action(['rm', '--cached'], 'file.txt')
 
-        self.subprocess.call.assert_called_once_with(
-            ['git', 'rm', '--cached', '--', os.path.join('/', 'file.txt')],
+        self.assert_called_once_as(
+            self.subprocess.call,
+            ['git', 'rm', '--cached', '--', ROOT_FILE_PATH],
             stdout=self.subprocess.PIPE,
             stderr=None
         )
 
     def test_does_not_ignore_stdout_when_requested(self):
-        self.repository_path.return_value = '/'
-
         perform_git_action(['add', '--patch'], 'file.txt', ignore_stdout=False)
 
-        self.subprocess.call.assert_called_once_with(
-            ['git', 'add', '--patch', '--', os.path.join('/', 'file.txt')],
+        self.assert_called_once_as(
+            self.subprocess.call,
+            ['git', 'add', '--patch', '--', ROOT_FILE_PATH],
             stdout=None,
             stderr=None
         )
 
     def test_ignores_stderr_when_requested(self):
-        self.repository_path.return_value = '/'
-
         perform_git_action('checkout', 'file.txt', ignore_stderr=True)
 
-        self.subprocess.call.assert_called_once_with(
-            ['git', 'checkout', '--', os.path.join('/', 'file.txt')],
+        self.assert_called_once_as(
+            self.subprocess.call,
+            ['git', 'checkout', '--', ROOT_FILE_PATH],
             stdout=self.subprocess.PIPE,
             stderr=self.subprocess.PIPE
         )
 
 
-class RepositoryPathTests(unittest.TestCase, WithPatching):
+class RepositoryPathTests(ClassPatching, unittest.TestCase):
     """Tests for repository_path()."""
 
+    PATCH_TARGETS = (
+        ('git_edit_index.subprocess', mock.Mock),
+    )
+
     def setUp(self):
-        super(RepositoryPathTests, self).setUp()
+        super().setUp()
 
-        self.subprocess = mock.Mock()
-        self.patch('git_edit_index.subprocess', self.subprocess)
+        repository_path.cache_clear()
+        self.addCleanup(repository_path.cache_clear)
 
     def test_calls_correct_git_command_and_returns_correct_path(self):
         REPOSITORY_PATH = '/path/to/repo'
@@ -667,32 +656,29 @@ class RepositoryPathTests(unittest.TestCase, WithPatching):
         path = repository_path()
 
         self.assertEqual(path, REPOSITORY_PATH)
-        self.subprocess.check_output.assert_called_once_with(
+        self.assert_called_once_as(
+            self.subprocess.check_output,
             ['git', 'rev-parse', '--show-toplevel'],
             universal_newlines=True
         )
 
+    def test_calls_git_only_once_when_called_repeatedly(self):
+        self.subprocess.check_output.return_value = '/path/to/repo\n'
 
-class ShouldReflectChangesOnEmptyBufferTests(unittest.TestCase, WithPatching):
-    """Tests for `should_reflect_changes_on_empty_buffer()`."""
+        repository_path()
+        path = repository_path()
 
-    def setUp(self):
-        super(ShouldReflectChangesOnEmptyBufferTests, self).setUp()
+        self.assertEqual(path, '/path/to/repo')
+        self.assertEqual(self.subprocess.check_output.call_count, 1)
 
-        self.stderr = StringIO()
-        self.patch('sys.stderr', self.stderr)
 
-        self.value_for_config_option = mock.Mock()
-        self.patch(
-            'git_edit_index.value_for_config_option',
-            self.value_for_config_option
-        )
+class ShouldReflectChangesOnEmptyBufferTests(ClassPatching, unittest.TestCase, WithPatching):
+    """Tests for `should_reflect_changes_on_empty_buffer()`."""
 
-        self.ask_user_whether_reflect_changes_on_empty_buffer = mock.Mock()
-        self.patch(
-            'git_edit_index.ask_user_whether_reflect_changes_on_empty_buffer',
-            self.ask_user_whether_reflect_changes_on_empty_buffer
-        )
+    PATCH_TARGETS = (
+        ('git_edit_index.value_for_config_option', mock.Mock),
+        ('git_edit_index.ask_user_whether_reflect_changes_on_empty_buffer', mock.Mock),
+    )
 
     def test_returns_true_when_config_option_is_set_to_act(self):
         self.value_for_config_option.return_value = 'act'
@@ -720,21 +706,22 @@ class ShouldReflectChangesOnEmptyBufferTests(unittest.TestCase, WithPatching):
 
     def test_prints_error_and_exits_when_config_option_is_set_to_unsupported_value(self):
         self.value_for_config_option.return_value = 'xxx'
+        # Only this test produces output, so capture it only here.
+        stderr = OutputSink()
+        self.patch(sys, 'stderr', stderr)
 
         with self.assertRaises(SystemExit) as cm:
             should_reflect_changes_on_empty_buffer()
-        self.assertIn('xxx', self.stderr.getvalue())
+        self.assertIn('xxx', stderr.getvalue())
         self.assertEqual(cm.exception.code, 1)
 
 
-class AskUserWhetherReflectChangesOnEmptyBufferTests(unittest.TestCase, WithPatching):
+class AskUserWhetherReflectChangesOnEmptyBufferTests(ClassPatching, unittest.TestCase):
     """Tests for `ask_user_whether_reflect_changes_on_empty_buffer()`."""
 
-    def setUp(self):
-        super(AskUserWhetherReflectChangesOnEmptyBufferTests, self).setUp()
-
-        self.input = mock.Mock()
-        self.patch('git_edit_index.input', self.input)
+    PATCH_TARGETS = (
+        ('git_edit_index.input', mock.Mock),
+    )
 
     def test_asks_user_and_returns_true_when_user_answered_lowercase_y(self):
         self.input.return_value = 'y'
@@ -757,14 +744,12 @@ class AskUserWhetherReflectChangesOnEmptyBufferTests(unittest.TestCase, WithPatc
         self.assertFalse(ask_user_whether_reflect_changes_on_empty_buffer())
 
 
-class ValueForConfigOptionTests(unittest.TestCase, WithPatching):
+class ValueForConfigOptionTests(ClassPatching, unittest.TestCase):
     """Tests for `value_for_config_option()`."""
 
-    def setUp(self):
-        super(ValueForConfigOptionTests, self).setUp()
-
-        self.subprocess = mock.Mock()
-        self.patch('git_edit_index.subprocess', self.subprocess)
+    PATCH_TARGETS = (
+        ('git_edit_index.subprocess', mock.Mock),
+    )
 
     def test_runs_correct_command_and_returns_its_output(self):
         self.subprocess.check_output.return_value = 'value\n'
@@ -772,7 +757,8 @@ class ValueForConfigOptionTests(unittest.TestCase, WithPatching):
         value = value_for_config_option('section.option')
 
         self.assertEqual(value, 'value')
-        self.subprocess.check_output.assert_called_once_with(
+        self.assert_called_once_as(
+            self.subprocess.check_output,
             ['git', 'config', 'section.option'],
             universal_newlines=True
         )
@@ -786,66 +772,75 @@ class ValueForConfigOptionTests(unittest.TestCase, WithPatching):
         self.assertIsNone(value)
 
 
-class MainTests(unittest.TestCase, WithPatching):
-    """Tests for main() and parse_args()."""
-
-    def setUp(self):
-        super(MainTests, self).setUp()
+class ArgsParserTests(unittest.TestCase):
+    """Tests for args_parser()."""
 
-        self.stdout = StringIO()
-        self.patch('sys.stdout', self.stdout)
+    def test_returns_same_parser_when_called_repeatedly(self):
+        self.assertIs(args_parser(), args_parser())
 
-        self.stderr = StringIO()
-        self.patch('sys.stderr', self.stderr)
 
-        self.current_index = mock.Mock()
-        self.patch('git_edit_index.current_index', self.current_index)
+class ParseArgsTests(unittest.TestCase, WithPatching):
+    """Tests for parse_args()."""
 
-        self.edit_index = mock.Mock()
-        self.patch('git_edit_index.edit_index', self.edit_index)
+    def setUp(self):
+        super().setUp()
 
-        self.should_reflect_changes_on_empty_buffer = mock.Mock()
-        self.patch(
-            'git_edit_index.should_reflect_changes_on_empty_buffer',
-            self.should_reflect_changes_on_empty_buffer
-        )
+        self.stdout = OutputSink()
+        self.patch(sys, 'stdout', self.stdout)
 
-        self.reflect_index_changes = mock.Mock()
-        self.patch('git_edit_index.reflect_index_changes', self.reflect_index_changes)
+        self.stderr = OutputSink()
+        self.patch(sys, 'stderr', self.stderr)
 
     def test_prints_help_to_stdout_and_exits_with_zero_when_requested(self):
         with self.assertRaises(SystemExit) as cm:
-            main(['git-edit-index', '--help'])
+            parse_args(['--help'])
         self.assertIn('help', self.stdout.getvalue())
         self.assertEqual(cm.exception.code, 0)
 
     def test_prints_version_to_stdout_and_exits_with_zero_when_requested(self):
         with self.assertRaises(SystemExit) as cm:
-            main(['git-edit-index', '--version'])
-        # Python < 3.4 emits the version to stderr, Python >= 3.4 to stdout.
-        output = self.stdout.getvalue() + self.stderr.getvalue()
-        self.assertIn(__version__, output)
+            parse_args(['--version'])
+        self.assertIn(__version__, self.stdout.getvalue())
         self.assertEqual(cm.exception.code, 0)
 
     def test_exits_with_non_zero_return_code_when_invalid_parameter_is_given(self):
         with self.assertRaises(SystemExit) as cm:
-            main(['git-edit-index', '--xxx'])
+            parse_args(['--xxx'])
         self.assertIn('--xxx', self.stderr.getvalue())
         self.assertNotEqual(cm.exception.code, 0)
 
+    def test_ignored_files_are_not_shown_by_default(self):
+        args = parse_args([])
+
+        self.assertIsNone(args.ignored)
+
+
+class MainTests(ClassPatching, unittest.TestCase):
+    """Tests for main()."""
+
+    PATCH_TARGETS = (
+        # Autospecced mocks fail when main() calls them with arguments that
+        # do not match the signatures of the real functions.
+        ('git_edit_index.current_index', lambda: mock.create_autospec(current_index)),
+        ('git_edit_index.edit_index', lambda: mock.create_autospec(edit_index)),
+        ('git_edit_index.should_reflect_changes_on_empty_buffer', mock.Mock),
+        ('git_edit_index.reflect_index_changes', mock.Mock),
+    )
+
     def test_shows_editor_to_user_and_reflects_changes_when_index_is_nonempty(self):
-        orig_index = Index([IndexEntry('M', 'file.txt')])
+        orig_index = MODIFIED_FILE_INDEX
         self.current_index.return_value = orig_index
 
         main(['git-edit-index'])
 
-        self.edit_index.assert_called_once_with(orig_index)
-        self.reflect_index_changes.assert_called_once_with(
+        self.assert_called_once_as(self.edit_index, orig_index)
+        self.assert_called_once_as(
+            self.reflect_index_changes,
             orig_index, self.edit_index.return_value
         )
 
     def test_reflects_changes_when_changes_should_be_reflected_on_empty_buffer(self):
-        self.current_index.return_value = Index([IndexEntry('M', 'file.txt')])
+        self.current_index.return_value = MODIFIED_FILE_INDEX
         self.edit_index.return_value = Index()
         self.should_reflect_changes_on_empty_buffer.return_value = True
 
@@ -855,7 +850,7 @@ class MainTests(unittest.TestCase, WithPatching):
         self.assertTrue(self.reflect_index_changes.called)
 
     def test_does_not_reflect_changes_when_changes_should_not_be_reflected_on_empty_buffer(self):
-        self.current_index.return_value = Index([IndexEntry('M', 'file.txt')])
+        self.current_index.return_value = MODIFIED_FILE_INDEX
         self.edit_index.return_value = Index()
         self.should_reflect_changes_on_empty_buffer.return_value = False
 